@@ -1,133 +1,469 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import os
+import re
 import sys
+import fnmatch
+import hashlib
+import json
+import mmap
+import time
 import shutil
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Script liegt neben src/; einmal beim Import aufgelöst
+ROOT = Path(__file__).resolve().parent
+
+# typische Android/Termux shared-storage Pfade
+_STORAGE0_RE = re.compile(rb"^(?:/storage/emulated/0|/sdcard|/storage/self/primary)/")
 
 def is_storage0_path(p: Path) -> bool:
-    s = str(p.resolve())
-    # typische Android/Termux shared-storage Pfade
-    prefixes = (
-        "/storage/emulated/0/",
-        "/sdcard/",
-        "/storage/self/primary/",
-    )
-    return any(s.startswith(x) for x in prefixes)
-
-def run(cmd, cwd: Path):
+    # p muss schon aufgelöst sein (z.B. ROOT), hier kein realpath pro Aufruf
+    return _STORAGE0_RE.match(os.fsencode(p)) is not None
+
+# esbuild-JS-API: beide Bundles (dev + min) in einem node-Prozess.
+# Wird per stdin an `node -` übergeben; argv: <out_dev> <out_min>
+ESBUILD_SCRIPT = r"""
+const fs = require("fs");
+const path = require("path");
+// UIKIT_ESBUILD: bereits bekanntes esbuild-Paketverzeichnis (ohne npx).
+// Sonst: npx -p esbuild legt <cache>/node_modules/.bin in den PATH.
+// Nur die gepinnte Version (UIKIT_ESBUILD_VERSION) wird akzeptiert.
+const want = process.env.UIKIT_ESBUILD_VERSION;
+const versionOf = (dir) => {
+  try { return require(path.join(dir, "package.json")).version; } catch (e) { return null; }
+};
+let esbuildDir = process.env.UIKIT_ESBUILD || null;
+for (const d of (process.env.PATH || "").split(path.delimiter)) {
+  if (esbuildDir) break;
+  if (path.basename(d) !== ".bin" || path.basename(path.dirname(d)) !== "node_modules") continue;
+  const dir = path.join(path.dirname(d), "esbuild");
+  if (versionOf(dir) === want) esbuildDir = dir;
+}
+if (!esbuildDir) {
+  try {
+    const dir = path.dirname(require.resolve("esbuild/package.json"));
+    if (versionOf(dir) === want) esbuildDir = dir;
+  } catch (e) {}
+}
+if (!esbuildDir) {
+  console.error(`esbuild ${want} not found`);
+  process.exit(1);
+}
+const esbuild = require(esbuildDir);
+// aufgelöstes Verzeichnis für den nächsten Lauf merken, siehe esbuild_command()
+if (process.env.UIKIT_ESBUILD_CACHE) fs.writeFileSync(process.env.UIKIT_ESBUILD_CACHE, esbuildDir);
+
+const [outDev, outMin] = process.argv.slice(2);
+const common = {
+  entryPoints: ["./src/ui-kit-0.js"],
+  bundle: true,
+  format: "esm",
+  target: "es2020",
+  logLevel: "info",
+};
+// Metafile (Inputs des Bundles) landet neben den Outputs, siehe META_FILES
+const build = (opts, meta) =>
+  esbuild.build({ ...common, ...opts, metafile: true }).then((r) =>
+    fs.writeFileSync(path.join(path.dirname(opts.outfile), meta), JSON.stringify(r.metafile)));
+Promise.all([
+  build({ sourcemap: true, outfile: outDev }, ".meta-dev.json"),
+  build({ minify: true, outfile: outMin }, ".meta-min.json"),
+]).catch((e) => {
+  console.error(e);
+  process.exit(1);
+});
+"""
+META_FILES = (".meta-dev.json", ".meta-min.json")
+
+ESBUILD_VERSION = "0.25.0"  # gepinnt: npx muss nicht jedes Mal die Version auflösen
+ESBUILD_PKG = f"esbuild@{ESBUILD_VERSION}"
+
+def _package_version(pkg_dir: str) -> str | None:
+    try:
+        return json.loads(Path(pkg_dir, "package.json").read_text(encoding="utf-8")).get("version")
+    except (OSError, ValueError):
+        return None
+
+def esbuild_command(ws: Path, args):
+    """
+    (cmd, env) für den esbuild-Lauf. Beim ersten Mal über npx; das Script
+    merkt sich das Paketverzeichnis in ws/<ESBUILD_PKG>.path, danach wird
+    node direkt ohne npx gestartet.
+    """
+    path_file = ws / f"{ESBUILD_PKG}.path"
+    try:
+        esbuild_dir = path_file.read_text(encoding="utf-8").strip()
+    except OSError:
+        esbuild_dir = ""
+    env = dict(os.environ, UIKIT_ESBUILD_VERSION=ESBUILD_VERSION)
+    # gemerktes Verzeichnis nur nutzen, wenn es noch die gepinnte Version enthält
+    if esbuild_dir and _package_version(esbuild_dir) == ESBUILD_VERSION:
+        return ["node", "-", *args], dict(env, UIKIT_ESBUILD=esbuild_dir)
+    cmd = ["npx", "-y", "-p", ESBUILD_PKG, "node", "-", *args]
+    return cmd, dict(env, UIKIT_ESBUILD_CACHE=str(path_file))
+
+def start(cmd, cwd: Path, input: str | None = None, env=None) -> subprocess.Popen:
+    # nicht blockierend; Ergebnis via wait()
     print("$ " + " ".join(cmd) + f"  (cwd={cwd})")
-    subprocess.check_call(cmd, cwd=str(cwd))
+    proc = subprocess.Popen(cmd, cwd=str(cwd), stdin=subprocess.PIPE, text=True, env=env)
+    proc.stdin.write(input or "")
+    proc.stdin.close()
+    return proc
+
+def wait(proc: subprocess.Popen):
+    rc = proc.wait()
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, proc.args)
+
+_VERSION_DISALLOWED = re.compile(r"[^A-Za-z0-9._\-]+")
 
 def sanitize_version(v: str) -> str:
-    v = v.strip()
-    allowed = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-")
-    out = "".join(ch for ch in v if ch in allowed)
+    out = _VERSION_DISALLOWED.sub("", v.strip())
     if not out:
         raise SystemExit("ERROR: invalid version (allowed: letters/digits . _ -)")
     return out
 
-def copy_project(src_root: Path, dst_root: Path):
-    # wirklich simpel: copytree ohne node_modules und dist
-    ignore = shutil.ignore_patterns("node_modules", "dist", ".git", "__pycache__", "*.pyc")
+COPY_IGNORE = ("node_modules", "dist", ".git", "__pycache__", "*.pyc")
+
+# Staging für esbuild: nur Bundle-Inputs, third_party wird nie importiert
+STAGE_IGNORE = COPY_IGNORE + ("third_party",)
+
+def _is_ignored(name: str, ignore=COPY_IGNORE) -> bool:
+    return any(fnmatch.fnmatch(name, pat) for pat in ignore)
+
+def _copy_native(src_root: Path, dst_root: Path, ignore):
+    if os.name == "nt":
+        # Muster als Verzeichnis- und Dateinamen ausschließen (wie ignore_patterns)
+        cmd = ["robocopy", str(src_root), str(dst_root), "/E", "/NFL", "/NDL", "/NJH", "/NJS", "/MT:16",
+               "/XD", *ignore, "/XF", *ignore]
+        rc = subprocess.call(cmd)
+        # robocopy: 0-7 = ok (1 = Dateien kopiert), ab 8 = Fehler
+        if rc >= 8:
+            raise subprocess.CalledProcessError(rc, cmd)
+        return
+
+    # GNU cp kennt kein --exclude: Top-Level filtern, Rest danach entfernen
+    dst_root.mkdir(parents=True)
+    entries = [e.path for e in os.scandir(src_root) if not _is_ignored(e.name, ignore)]
+    if entries:
+        subprocess.check_call(["cp", "-a", "--reflink=auto", *entries, str(dst_root)])
+    for dirpath, dirnames, filenames in os.walk(dst_root):
+        for d in [d for d in dirnames if _is_ignored(d, ignore)]:
+            shutil.rmtree(os.path.join(dirpath, d))
+            dirnames.remove(d)
+        for f in filenames:
+            if _is_ignored(f, ignore):
+                os.remove(os.path.join(dirpath, f))
+
+def copy_project(src_root: Path, dst_root: Path, ignore=COPY_IGNORE):
+    # ohne ignore-Muster; native Kopie (cp/robocopy), copytree als Fallback
     if dst_root.exists():
         shutil.rmtree(dst_root)
-    shutil.copytree(src_root, dst_root, ignore=ignore)
+    try:
+        _copy_native(src_root, dst_root, ignore)
+        return
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"native copy failed ({e}), falling back to copytree")
+        if dst_root.exists():
+            shutil.rmtree(dst_root)
+    shutil.copytree(src_root, dst_root, ignore=shutil.ignore_patterns(*ignore))
 
-def main():
-    # Script liegt neben src/
-    root = Path(__file__).resolve().parent
-    src_dir = root / "src"
-    dist_dir = root / "dist"
-    entry = src_dir / "ui-kit-0.js"  # simple assumption
+MMAP_MIN_SIZE = 64 * 1024  # größere Dateien per mmap hashen statt read()
 
-    if not src_dir.is_dir():
-        raise SystemExit(f"ERROR: src/ not found next to {Path(__file__).name}")
-    if not entry.is_file():
-        raise SystemExit(f"ERROR: entry not found: {entry}")
+def file_digest(path) -> str:
+    # blake2b/128: schnell und reicht als Cache-Key (keine Sicherheitsgrenze)
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            h.update(f.read())
+    return h.hexdigest()
 
-    if len(sys.argv) != 2:
-        raise SystemExit(f"Usage: {Path(__file__).name} <version>\nExample: {Path(__file__).name} 0.0.1")
-    version = sanitize_version(sys.argv[1])
+def _digest_or_none(path):
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
 
-    name = "ui-kit-0"
-    out_dev = f"{name}-{version}.js"
-    out_min = f"{name}-{version}.min.js"
+BUILD_STATE = ".build_state.json"
 
-    dist_dir.mkdir(parents=True, exist_ok=True)
+def build_state_fresh(dist_dir: Path, root: Path, argv_hash: str, outputs) -> bool:
+    # dist/ aktuell, wenn argv gleich und alle Inputs laut esbuild-Metafile unverändert
+    try:
+        state = json.loads((dist_dir / BUILD_STATE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    inputs = state.get("inputs") or {}
+    if state.get("argv") != argv_hash or state.get("outputs") != list(outputs) or not inputs:
+        return False
+    if not all((dist_dir / fn).is_file() for fn in outputs):
+        return False
+    with ThreadPoolExecutor() as ex:
+        current = list(ex.map(_digest_or_none, (root / rel for rel in inputs)))
+    return current == list(inputs.values())
 
-    # Wenn Projekt in storage0 liegt, in $HOME bauen
-    build_root = root
-    building_in_home = is_storage0_path(root)
-    if building_in_home:
-        home = Path(os.environ.get("HOME", str(Path("~").expanduser()))).resolve()
-        ws = home / ".uikit_release"
-        ws.mkdir(parents=True, exist_ok=True)
-        build_root = ws / f"build_{root.name}"
-        copy_project(root, build_root)
+def write_build_state(dist_dir: Path, root: Path, argv_hash: str, outputs):
+    inputs = set()
+    for meta in META_FILES:
+        inputs.update(json.loads((dist_dir / meta).read_text(encoding="utf-8"))["inputs"])
+    rels = sorted(inputs)
+    with ThreadPoolExecutor() as ex:
+        digests = list(ex.map(_digest_or_none, (root / rel for rel in rels)))
+    state = {"argv": argv_hash, "outputs": list(outputs), "inputs": dict(zip(rels, digests))}
+    (dist_dir / BUILD_STATE).write_text(json.dumps(state, indent=2), encoding="utf-8")
 
-    # Ensure dist in build root
-    (build_root / "dist").mkdir(parents=True, exist_ok=True)
+CACHE_KEEP = 8  # Anzahl Builds, die im Cache bleiben
 
-    # esbuild über npx (kein npm install nötig)
-    common = ["npx", "-y", "esbuild", "./src/ui-kit-0.js", "--bundle", "--format=esm", "--target=es2020"]
+def build_cache_key(src_dir: Path, version: str, esbuild_args) -> str:
+    # Content-Hash (nicht mtime): stabil gegenüber git checkout/touch
+    h = hashlib.blake2b(digest_size=16)
+    for part in (version, *esbuild_args):
+        h.update(part.encode() + b"\0")
+    files = []
+    for p in sorted(src_dir.rglob("*")):
+        rel = p.relative_to(src_dir)
+        if p.name.endswith(".map") or any(_is_ignored(x) for x in rel.parts) or not p.is_file():
+            continue
+        files.append((rel, p))
+    # hashlib gibt bei großen Puffern den GIL frei -> Threads lohnen sich
+    with ThreadPoolExecutor() as ex:
+        digests = ex.map(lambda rp: file_digest(rp[1]), files)
+        for (rel, p), digest in zip(files, digests):
+            h.update(f"{rel.as_posix()}\0{p.stat().st_size}\0{digest}\0".encode())
+    return h.hexdigest()
 
-    # unminified
-    run(common + ["--sourcemap", f"--outfile=./dist/{out_dev}"], cwd=build_root)
-    # minified
-    run(common + ["--minify", f"--outfile=./dist/{out_min}"], cwd=build_root)
+def _cache_touch(cache_root: Path, key: str):
+    # index.json: {key: last_used}; älteste Einträge über CACHE_KEEP werden gelöscht
+    index_file = cache_root / "index.json"
+    try:
+        index = json.loads(index_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = {}
+    index[key] = time.time()
+    for old in sorted(index, key=index.get, reverse=True)[CACHE_KEEP:]:
+        shutil.rmtree(cache_root / old, ignore_errors=True)
+        del index[old]
+    index_file.write_text(json.dumps(index, indent=2), encoding="utf-8")
 
-    # Ergebnis zurückkopieren, wenn wir in $HOME gebaut haben
-    if building_in_home:
-        built_dist = build_root / "dist"
-        for fn in (out_dev, out_dev + ".map", out_min):
-            shutil.copy2(built_dist / fn, dist_dir / fn)
-    
+def cache_lookup(cache_root: Path, key: str, files) -> Path | None:
+    entry = cache_root / key
+    if not all((entry / fn).is_file() for fn in files):
+        return None
+    _cache_touch(cache_root, key)
+    return entry
+
+def cache_store(cache_root: Path, key: str, src: Path, files):
+    entry = cache_root / key
+    tmp = cache_root / (key + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for fn in files:
+        shutil.copy2(src / fn, tmp / fn)
+    if entry.exists():
+        shutil.rmtree(entry)
+    os.replace(tmp, entry)
+    _cache_touch(cache_root, key)
+
+def _iter_files(root, rel: str = ""):
+    # os.scandir: DirEntry bringt Typ (und gecachten stat) mit -> keine extra stat()-Aufrufe
+    with os.scandir(root) as it:
+        for entry in it:
+            entry_rel = os.path.join(rel, entry.name) if rel else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path, entry_rel)
+            elif entry.is_file():
+                yield entry, entry_rel
+
+# Kernel-seitiges Kopieren, in dieser Reihenfolge probiert (Linux)
+_KERNEL_COPY = []
+if hasattr(os, "copy_file_range"):
+    _KERNEL_COPY.append(lambda sfd, dfd, n: os.copy_file_range(sfd, dfd, n))
+if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+    _KERNEL_COPY.append(lambda sfd, dfd, n: os.sendfile(dfd, sfd, None, n))
+
+def fast_copy(src, dst, src_stat: os.stat_result | None = None):
+    # nur Inhalt, keine Metadaten (mtime/Rechte) – für Release-Artefakte unnötig
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        sfd, dfd = fsrc.fileno(), fdst.fileno()
+        remaining = (src_stat or os.fstat(sfd)).st_size
+        # Fehler (z.B. EXDEV/ENOSYS) oder 0 vor Dateiende (z.B. FUSE):
+        # ab aktueller Position mit der nächsten Methode weiter
+        for kernel_copy in _KERNEL_COPY:
+            try:
+                while remaining > 0:
+                    n = kernel_copy(sfd, dfd, remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            except OSError:
+                continue
+            if remaining == 0:
+                return
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+# Kopieren ist syscall-/latenzgebunden (GIL frei): mehr Threads als Kerne.
+# Windows (CopyFile) ist noch stärker latenzgebunden.
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+if os.name == "nt":
+    COPY_WORKERS = min(64, (os.cpu_count() or 1) * 8)
+
+def deploy_static(root: Path, dist_dir: Path):
     src_files = ["sbom.json", "ui-kit-0.theme.css", "ui-kit-0.css"]
     for fn in src_files:
-        src_src = build_root / "src" / fn
+        src_src = root / "src" / fn
         if src_src.is_file():
-            shutil.copy2(src_src, dist_dir / fn)
+            fast_copy(src_src, dist_dir / fn)
 
     doc_files = ["API.md", "README.md", "Styling.md"]
     for fn in doc_files:
-        doc_src = build_root / fn
+        doc_src = root / fn
         if doc_src.is_file():
-            shutil.copy2(doc_src, dist_dir / fn)
+            fast_copy(doc_src, dist_dir / fn)
     
     # third_party deploy:
     # - default: only *.min.js
     # - exception: include ace/*.js (ace has no min in your tree)
     # - never include *.map
-    tp_src = build_root / "src" / "third_party"
+    tp_src = root / "src" / "third_party"
     tp_dst = dist_dir / "third_party"
 
     if tp_src.is_dir():
-        # clean target
-        if tp_dst.exists():
-            shutil.rmtree(tp_dst)
+        # inkrementell: nur geänderte Dateien kopieren, verwaiste löschen
         tp_dst.mkdir(parents=True, exist_ok=True)
+        existing = {rel: entry.stat() for entry, rel in _iter_files(tp_dst)}
 
-        def copy_rel(src_file: Path):
-            rel = src_file.relative_to(tp_src)
-            out = tp_dst / rel
-            out.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src_file, out)
+        pairs = []
+        wanted = set()
+
+        def copy_rel(entry: os.DirEntry, rel: str):
+            wanted.add(rel)
+            st = entry.stat()
+            old = existing.get(rel)
+            if old is not None and (old.st_size, old.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+                return
+            pairs.append((entry.path, tp_dst / rel, st))
+
+        # ein Durchlauf für beide Regeln:
+        # 1) all *.min.js recursively (no maps)
+        # 2) ace/*.js (no maps) because ace isn't minified in your tree
+        for entry, rel in _iter_files(tp_src):
+            name = entry.name
+            # *.map fällt schon durch die Endungen raus
+            if name.endswith(".min.js") or (name.endswith(".js") and os.path.dirname(rel) == "ace"):
+                copy_rel(entry, rel)
+
+        # Zielverzeichnisse einmal pro Verzeichnis anlegen, nicht pro Datei
+        for d in sorted({dst.parent for _, dst, _ in pairs}, key=lambda d: len(d.parts)):
+            os.makedirs(d, exist_ok=True)
+
+        def copy_pair(src, dst, st):
+            fast_copy(src, dst, st)
+            # mtime übernehmen, damit der nächste Lauf die Datei als unverändert erkennt
+            os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        # viele kleine Dateien: open()-Latenz überlappen
+        if pairs:
+            with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+                list(ex.map(lambda st: copy_pair(*st), pairs))
+
+        for rel in existing.keys() - wanted:
+            os.remove(tp_dst / rel)
+        for dirpath, _, _ in os.walk(tp_dst, topdown=False):
+            if dirpath != str(tp_dst) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+def build_bundle(root: Path, ws: Path, esbuild_args, dist_dir: Path, outputs):
+    # Wenn Projekt in storage0 liegt, in $HOME bauen
+    build_root = root
+    building_in_home = is_storage0_path(root)
+    if building_in_home:
+        build_root = ws / f"build_{root.name}"
+        # nur die Bundle-Inputs stagen (src/ ohne third_party); Docs und
+        # third_party liest deploy_static direkt aus root
+        if build_root.exists():
+            shutil.rmtree(build_root)
+        copy_project(root / "src", build_root / "src", ignore=STAGE_IGNORE)
+
+    # Ensure dist in build root
+    (build_root / "dist").mkdir(parents=True, exist_ok=True)
+
+    cmd, env = esbuild_command(ws, esbuild_args)
+    proc = start(cmd, cwd=build_root, input=ESBUILD_SCRIPT, env=env)
+
+    # statische Dateien deployen, während esbuild läuft (unabhängig vom Bundle)
+    try:
+        deploy_static(root, dist_dir)
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    wait(proc)
+
+    # Ergebnis zurückkopieren, wenn wir in $HOME gebaut haben
+    if building_in_home:
+        built_dist = build_root / "dist"
+        for fn in outputs:
+            shutil.copy2(built_dist / fn, dist_dir / fn)
+
+def main():
+    root = ROOT
+    src_dir = root / "src"
+    dist_dir = root / "dist"
+    entry = src_dir / "ui-kit-0.js"  # simple assumption
+
+    if not src_dir.is_dir():
+        raise SystemExit(f"ERROR: src/ not found next to {Path(__file__).name}")
+    if not entry.is_file():
+        raise SystemExit(f"ERROR: entry not found: {entry}")
+
+    if len(sys.argv) != 2:
+        raise SystemExit(f"Usage: {Path(__file__).name} <version>\nExample: {Path(__file__).name} 0.0.1")
+    version = sanitize_version(sys.argv[1])
+
+    name = "ui-kit-0"
+    out_dev = f"{name}-{version}.js"
+    out_min = f"{name}-{version}.min.js"
+
+    dist_dir.mkdir(parents=True, exist_ok=True)
+
+    home = Path(os.environ.get("HOME", str(Path("~").expanduser()))).resolve()
+    ws = home / ".uikit_release"
+    ws.mkdir(parents=True, exist_ok=True)
+
+    # esbuild über npx (kein npm install nötig), unminified + minified in einem Lauf
+    esbuild_args = [f"./dist/{out_dev}", f"./dist/{out_min}"]
+    outputs = (out_dev, out_dev + ".map", out_min, *META_FILES)
+    # Build-Identität unabhängig davon, ob esbuild über npx oder direkt läuft
+    build_id = [ESBUILD_PKG, *esbuild_args, ESBUILD_SCRIPT]
+    argv_hash = hashlib.blake2b("\0".join(build_id).encode(), digest_size=16).hexdigest()
+
+    # dist/ schon aktuell -> nur statische Dateien
+    if build_state_fresh(dist_dir, root, argv_hash, outputs):
+        print(f"up to date: dist/{BUILD_STATE}")
+        deploy_static(root, dist_dir)
+    else:
+        # Cache-Treffer: Quellen unverändert -> kein Staging, kein esbuild
+        cache_root = ws / "cache"
+        key = build_cache_key(src_dir, version, build_id)
+        cached = cache_lookup(cache_root, key, outputs)
+        if cached is not None:
+            print(f"cache hit: {key}")
+            deploy_static(root, dist_dir)
+            for fn in outputs:
+                shutil.copy2(cached / fn, dist_dir / fn)
+        else:
+            build_bundle(root, ws, esbuild_args, dist_dir, outputs)
+            cache_store(cache_root, key, dist_dir, outputs)
+
+        write_build_state(dist_dir, root, argv_hash, outputs)
 
-        # 1) copy all *.min.js recursively (no maps)
-        for p in tp_src.rglob("*.min.js"):
-            if p.name.endswith(".map"):
-                continue
-            copy_rel(p)
-
-        # 2) copy ace/*.js (no maps) because ace isn't minified in your tree
-        ace_dir = tp_src / "ace"
-        if ace_dir.is_dir():
-            for p in ace_dir.glob("*.js"):
-                if p.name.endswith(".map"):
-                    continue
-                copy_rel(p)
-    
     print("\nDone:")
     print(f" - dist/{out_dev}")
     print(f" - dist/{out_min}")
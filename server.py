@@ -13,20 +13,31 @@ Dann im Browser:
 
 from __future__ import annotations
 
+import io
 import sys
 from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 
 
+# Harte No-Cache-Header (wirken auch bei Proxies), einmal beim Import kodiert
+_NOCACHE_HEADERS = (
+    b"Cache-Control: no-store, no-cache, must-revalidate, max-age=0\r\n"
+    b"Pragma: no-cache\r\n"
+    b"Expires: 0\r\n"
+)
+
+
 class NoCacheHandler(SimpleHTTPRequestHandler):
     # Optional: etwas weniger "lautes" Logging
     # def log_message(self, format, *args):
     #     pass
 
     def end_headers(self) -> None:
-        # Harte No-Cache-Header (wirken auch bei Proxies)
-        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
-        self.send_header("Pragma", "no-cache")
-        self.send_header("Expires", "0")
+        # Fertige No-Cache-Header direkt in den Header-Puffer (wie send_header,
+        # aber ohne Formatierung pro Request); HTTP/0.9 kennt keine Header
+        if self.request_version != "HTTP/0.9":
+            if not hasattr(self, "_headers_buffer"):
+                self._headers_buffer = []
+            self._headers_buffer.append(_NOCACHE_HEADERS)
 
         # Hilft manchmal bei CORS/ServiceWorker-Experimente (optional)
         # self.send_header("Cross-Origin-Opener-Policy", "same-origin")
@@ -34,27 +45,28 @@ class NoCacheHandler(SimpleHTTPRequestHandler):
 
         super().end_headers()
 
-    def send_head(self):
+    def copyfile(self, source, outputfile) -> None:
+        """
+        Dateien per socket.sendfile (Kernel sendfile(2)) ausliefern statt über
+        Python-Puffer. Alles andere geht den normalen Weg.
+        """
+        if outputfile is self.wfile and isinstance(source, io.BufferedReader):
+            outputfile.flush()
+            self.connection.sendfile(source)
+            return
+        super().copyfile(source, outputfile)
+
+    def parse_request(self) -> bool:
         """
         SimpleHTTPRequestHandler sendet sonst gern 304, wenn If-Modified-Since passt.
-        Wir neutralisieren das, indem wir Conditional-Header ignorieren.
+        Wir neutralisieren das, indem wir Conditional-Header direkt nach dem
+        Parsen verwerfen (statt sie pro Request zu sichern/wiederherzustellen).
         """
-        # Temporär Conditional Headers entfernen
-        saved_ims = self.headers.get("If-Modified-Since")
-        saved_inm = self.headers.get("If-None-Match")
-        if saved_ims is not None:
-            del self.headers["If-Modified-Since"]
-        if saved_inm is not None:
-            del self.headers["If-None-Match"]
-
-        try:
-            return super().send_head()
-        finally:
-            # Wiederherstellen (nicht zwingend nötig, aber sauber)
-            if saved_ims is not None:
-                self.headers["If-Modified-Since"] = saved_ims
-            if saved_inm is not None:
-                self.headers["If-None-Match"] = saved_inm
+        if not super().parse_request():
+            return False
+        del self.headers["If-Modified-Since"]
+        del self.headers["If-None-Match"]
+        return True
 
 
 def main() -> None: